@@ -1,26 +1,31 @@
 from __future__ import annotations
-from typing import Any, Dict, List
-import json
-from jsonschema import validate
+from typing import Any, Dict, List, Optional
+import json, os
+from jsonschema import validate, ValidationError
 from .azure_openai import AzureOpenAIClient
 from .bank import QUESTION_BANK
 
 DOMAINS = ["A","B","C","D","E","F","G"]
 
-LLM_RESPONSE_SCHEMA = {
+# Compact per-turn contract: the model only emits what changed this turn.
+# t=assistant_text, q=next_question_id, s=changed domain scores, e=new evidence tags,
+# d=done. The final report is always built locally by build_report.
+LLM_DELTA_SCHEMA = {
   "type": "object",
   "properties": {
-    "assistant_text": {"type":"string"},
-    "next_question_id": {"type":["string","null"]},
-    "scores": {"type":"object", "additionalProperties": {"type":"integer","minimum":0,"maximum":3}},
-    "evidence": {"type":"array", "items":{"type":"string"}},
-    "done": {"type":"boolean"},
-    "report": {"type":["object","null"]}
+    "t": {"type":"string"},
+    "q": {"type":["string","null"]},
+    "s": {"type":"object", "propertyNames": {"enum": DOMAINS}, "additionalProperties": {"type":"integer","minimum":0,"maximum":3}},
+    "e": {"type":"array", "items":{"type":"string"}},
+    "d": {"type":"boolean"}
   },
-  "required": ["assistant_text","next_question_id","scores","evidence","done","report"],
+  "required": ["t","q"],
   "additionalProperties": False
 }
 
+# The assessment completes on the turn after this many question IDs have been asked.
+MAX_QUESTIONS = 15
+
 SYSTEM_PROMPT = """You are an AI Literacy Assessor for a defense organization.
 Run a short interactive assessment and score the user.
 
@@ -32,18 +37,22 @@ Rules:
   0 Unaware/misconceptions; 1 Aware/basic; 2 Practicing with checks; 3 Proficient/sets standards.
 - Evidence tags: MISCONCEPTION, SAFE_PRACTICE, RISK_AWARE, GOV_AWARE, VALIDATION, PROMPT_SKILL.
 
-Return STRICT JSON only:
+Return STRICT compact JSON only, containing ONLY what changed this turn:
+- "t": short assistant text (1-2 sentences); do not repeat the next question.
+- "q": next question id from candidates, or null when FINAL_TURN is true.
+- "s": ONLY domains whose score changed this turn; omit if none.
+- "e": ONLY new evidence tags; omit if none.
+- "d": true only when the assessment is complete; omit otherwise.
 {
-  "assistant_text": string,
-  "next_question_id": string|null,
-  "scores": { "A":0..3, ... },
-  "evidence": [string,...],
-  "done": boolean,
-  "report": object|null
+  "t": string,
+  "q": string|null,
+  "s": { "A":0..3, ... },
+  "e": [string,...],
+  "d": boolean
 }
 
-If done=true, report must include:
-persona, overall_level(0..3), domain_scores, strengths, growth_areas, top_risks, learning_plan(3), notes.
+FINAL_TURN true means the user has answered the last question: score that answer, set "q": null and "d": true.
+Do not write a report; it is generated separately.
 """
 
 BANK_BY_ID = {q["id"]: q for q in QUESTION_BANK}
@@ -95,55 +104,97 @@ def build_report(persona: str, scores: Dict[str,int], evidence: List[str], notes
 class Assessor:
     def __init__(self):
         self.client = AzureOpenAIClient()
+        self.turn_max_tokens = int(os.environ.get("ASSESSOR_TURN_MAX_TOKENS", "250"))
+        self.retry_max_tokens = int(os.environ.get("ASSESSOR_RETRY_MAX_TOKENS", "900"))
 
     async def next(self, persona: str, asked_question_ids: List[str], messages: List[Dict[str,str]],
                    current_scores: Dict[str,int], current_evidence: List[str]) -> Dict[str, Any]:
+        """Run one assessment turn.
+
+        Returns a delta: ``scores`` holds only changed domains and ``evidence`` only new tags;
+        the caller merges both into the session. ``llm_calls`` counts model requests made and
+        ``completion_tokens`` is their generated-token total, or None if no usage was reported.
+        """
 
         candidates = candidate_questions(persona, asked_question_ids)
 
-        # Stop after ~15 asked IDs (the question IDs are appended when selected)
-        if len(asked_question_ids) >= 15 or not candidates:
-            rep = build_report(persona, current_scores, current_evidence, notes=[])
-            return {
-                "assistant_text": "Thanks — that completes the assessment. I’ll share your summary report now.",
-                "next_question_id": None,
-                "scores": {**current_scores},
-                "evidence": list(dict.fromkeys(current_evidence)),
-                "done": True,
-                "report": rep
-            }
+        # The last question has been answered: score it; the report itself is built locally.
+        final_turn = len(asked_question_ids) >= MAX_QUESTIONS or not candidates
 
         ctx = {
             "persona": persona,
             "asked_question_ids": asked_question_ids,
             "current_scores": current_scores,
             "current_evidence": current_evidence,
-            "candidates": candidates,
+            "candidates": [] if final_turn else candidates,
+            "FINAL_TURN": final_turn,
         }
 
         llm_messages = [
             {"role":"system","content": SYSTEM_PROMPT},
             {"role":"user","content": "CONTEXT_JSON:\n" + json.dumps(ctx, ensure_ascii=False)},
             {"role":"user","content": "CONVERSATION_SO_FAR:\n" + json.dumps(messages, ensure_ascii=False)},
-            {"role":"user","content": "Return STRICT JSON only, no markdown, no extra text."}
+            {"role":"user","content": "Return STRICT compact JSON only, no markdown, no extra text."}
         ]
 
-        raw = await self.client.chat_completions(llm_messages)
-        text = raw["choices"][0]["message"]["content"]
-
-        parsed = self._parse_json(text)
-        validate(instance=parsed, schema=LLM_RESPONSE_SCHEMA)
-
-        nid = parsed.get("next_question_id")
-        if nid is not None:
-            if nid not in BANK_BY_ID or nid in asked_question_ids:
+        max_tokens = self.turn_max_tokens
+        llm_calls = 0
+        completion_tokens: Optional[int] = None
+        delta: Optional[Dict[str, Any]] = None
+        while True:
+            raw = await self.client.chat_completions(llm_messages, max_tokens=max_tokens)
+            llm_calls += 1
+            usage = (raw.get("usage") or {}).get("completion_tokens")
+            if usage is not None:
+                completion_tokens = (completion_tokens or 0) + int(usage)
+            choice = (raw.get("choices") or [{}])[0]
+            finish_reason = choice.get("finish_reason")
+            if finish_reason == "length" and max_tokens < self.retry_max_tokens:
+                # Retry once with the larger budget rather than parsing cut-off JSON.
+                max_tokens = self.retry_max_tokens
+                continue
+            if finish_reason == "stop":
+                try:
+                    delta = self._parse_json((choice.get("message") or {}).get("content") or "")
+                    validate(instance=delta, schema=LLM_DELTA_SCHEMA)
+                except (ValueError, ValidationError) as e:
+                    print(f"assessor: discarding invalid LLM output: {e}")
+                    delta = None
+            else:
+                print(f"assessor: discarding LLM output with finish_reason={finish_reason}")
+            break
+
+        if delta is None:
+            # Neutral fallback: keep the assessment moving without applying any score changes.
+            if final_turn:
+                delta = {"t": "Thanks — that completes the assessment. I’ll share your summary report now.", "q": None, "d": True}
+            else:
+                delta = {"t": "Thanks.", "q": candidates[0]["id"]}
+
+        score_delta = {k: int(v) for k, v in (delta.get("s") or {}).items()}
+        new_evidence = [e for e in dict.fromkeys(delta.get("e") or []) if e not in current_evidence]
+        done = final_turn or bool(delta.get("d"))
+
+        nid = None
+        if not done:
+            nid = delta.get("q")
+            if nid is None or nid not in BANK_BY_ID or nid in asked_question_ids:
                 nid = candidates[0]["id"]
-            parsed["next_question_id"] = nid
-
-        if parsed.get("done") and not parsed.get("report"):
-            parsed["report"] = build_report(persona, parsed.get("scores", current_scores), parsed.get("evidence", current_evidence), notes=[])
 
-        return parsed
+        report = None
+        if done:
+            report = build_report(persona, {**current_scores, **score_delta}, current_evidence + new_evidence, notes=[])
+
+        return {
+            "assistant_text": delta["t"],
+            "next_question_id": nid,
+            "scores": score_delta,
+            "evidence": new_evidence,
+            "done": done,
+            "report": report,
+            "llm_calls": llm_calls,
+            "completion_tokens": completion_tokens,
+        }
 
     def _parse_json(self, s: str) -> Dict[str, Any]:
         s2 = s.strip().replace("```json", "```").replace("```", "")
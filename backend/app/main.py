@@ -1,5 +1,5 @@
 from __future__ import annotations
-import os
+import os, time
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -113,6 +113,7 @@ async def chat(session_id: str, req: ChatRequest):
 
     s.messages.append({"role":"user","content": req.user_text})
 
+    started = time.perf_counter()
     result = await assessor.next(
         persona=s.persona,
         asked_question_ids=s.asked_question_ids,
@@ -120,12 +121,19 @@ async def chat(session_id: str, req: ChatRequest):
         current_scores=s.scores,
         current_evidence=s.evidence,
     )
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
 
     assistant_text = result["assistant_text"]
     s.messages.append({"role":"assistant","content":assistant_text})
 
+    # result carries only the per-turn delta: changed scores and new evidence tags
     s.scores.update({k:int(v) for k,v in (result.get("scores") or {}).items()})
     s.evidence = list(dict.fromkeys((s.evidence or []) + (result.get("evidence") or [])))
+    s.llm_calls += int(result.get("llm_calls") or 0)
+    if result.get("completion_tokens") is not None:
+        s.completion_tokens += int(result["completion_tokens"])
+    print(f"assessor turn session={s.id} llm_calls={result.get('llm_calls')} "
+          f"completion_tokens={result.get('completion_tokens')} elapsed_ms={elapsed_ms}")
 
     nid = result.get("next_question_id")
     if nid:
@@ -90,6 +90,8 @@ def persist_final(session: Session) -> None:
             "scores": session.scores,
             "evidence": session.evidence,
             "report": session.report,
+            "completion_tokens": session.completion_tokens,
+            "llm_calls": session.llm_calls,
         }
         data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
         container.upload_blob(
@@ -15,6 +15,8 @@ class Session:
     done: bool = False
     report: Optional[Dict[str, Any]] = None
     persisted: bool = False
+    completion_tokens: int = 0
+    llm_calls: int = 0
 
 class InMemoryStore:
     def __init__(self):
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import asyncio, json
+from typing import Any, Dict, List
+
+import pytest
+
+from app.assessor import Assessor, MAX_QUESTIONS, candidate_questions
+
+
+def completion(content: Any, finish_reason: str = "stop", tokens: int | None = 10) -> Dict[str, Any]:
+    if not isinstance(content, str):
+        content = json.dumps(content)
+    raw: Dict[str, Any] = {"choices": [{"message": {"content": content}, "finish_reason": finish_reason}]}
+    if tokens is not None:
+        raw["usage"] = {"completion_tokens": tokens}
+    return raw
+
+
+class FakeClient:
+    def __init__(self, *responses: Dict[str, Any]):
+        self.responses = list(responses)
+        self.max_tokens: List[int] = []
+
+    async def chat_completions(self, messages, temperature: float = 0.2, max_tokens: int = 900):
+        self.max_tokens.append(max_tokens)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def make_assessor(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.invalid")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key")
+    monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT", "dep")
+    monkeypatch.setenv("ASSESSOR_TURN_MAX_TOKENS", "200")
+    monkeypatch.setenv("ASSESSOR_RETRY_MAX_TOKENS", "800")
+
+    def make(*responses: Dict[str, Any]) -> Assessor:
+        a = Assessor()
+        a.client = FakeClient(*responses)
+        return a
+    return make
+
+
+def run(a: Assessor, asked: List[str], scores: Dict[str, int], evidence: List[str]) -> Dict[str, Any]:
+    return asyncio.run(a.next(persona="PM", asked_question_ids=asked, messages=[],
+                              current_scores=scores, current_evidence=evidence))
+
+
+def test_normal_turn_returns_only_delta(make_assessor):
+    a = make_assessor(completion({"t": "Good.", "q": "CORE_B1", "s": {"C": 2}, "e": ["SAFE_PRACTICE", "RISK_AWARE"]}))
+    out = run(a, ["CORE_A1"], {"A": 1}, ["SAFE_PRACTICE"])
+
+    assert a.client.max_tokens == [200]
+    assert out["scores"] == {"C": 2}
+    assert out["evidence"] == ["RISK_AWARE"]
+    assert out["next_question_id"] == "CORE_B1"
+    assert out["done"] is False and out["report"] is None
+    assert out["llm_calls"] == 1 and out["completion_tokens"] == 10
+
+
+def test_already_asked_question_is_replaced(make_assessor):
+    a = make_assessor(completion({"t": "Ok.", "q": "CORE_A1"}))
+    out = run(a, ["CORE_A1"], {}, [])
+    assert out["next_question_id"] == candidate_questions("PM", ["CORE_A1"])[0]["id"]
+
+
+def test_schema_rejection_falls_back_to_empty_delta(make_assessor):
+    a = make_assessor(completion({"t": "Ok.", "q": "CORE_B1", "s": {"Z": 9}}))
+    out = run(a, ["CORE_A1"], {"A": 1}, [])
+    assert out["scores"] == {} and out["evidence"] == []
+    assert out["next_question_id"] == candidate_questions("PM", ["CORE_A1"])[0]["id"]
+    assert out["done"] is False
+
+
+def test_report_field_is_rejected(make_assessor):
+    a = make_assessor(completion({"t": "Ok.", "q": None, "s": {"A": 3}, "d": True, "r": {"domain_scores": {"A": 0}}}))
+    out = run(a, ["CORE_A1"], {}, [])
+    assert out["scores"] == {} and out["done"] is False
+
+
+def test_truncation_retries_once_with_larger_budget(make_assessor):
+    a = make_assessor(
+        completion('{"t": "Long', finish_reason="length", tokens=200),
+        completion({"t": "Ok.", "q": "CORE_B1", "s": {"B": 1}}, tokens=30),
+    )
+    out = run(a, ["CORE_A1"], {}, [])
+    assert a.client.max_tokens == [200, 800]
+    assert out["scores"] == {"B": 1}
+    assert out["llm_calls"] == 2 and out["completion_tokens"] == 230
+
+
+def test_repeated_truncation_falls_back(make_assessor):
+    a = make_assessor(
+        completion('{"t": "Long', finish_reason="length"),
+        completion('{"t": "Longer', finish_reason="length"),
+    )
+    out = run(a, ["CORE_A1"], {"A": 1}, [])
+    assert out["llm_calls"] == 2
+    assert out["scores"] == {}
+    assert out["next_question_id"] == candidate_questions("PM", ["CORE_A1"])[0]["id"]
+
+
+def test_content_filter_without_content_falls_back(make_assessor):
+    raw = {"choices": [{"message": {"role": "assistant"}, "finish_reason": "content_filter"}]}
+    a = make_assessor(raw)
+    out = run(a, ["CORE_A1"], {}, [])
+    assert out["scores"] == {} and out["done"] is False
+    assert out["llm_calls"] == 1 and out["completion_tokens"] is None
+
+
+def test_final_turn_scores_last_answer_and_builds_report_locally(make_assessor):
+    asked = [q["id"] for q in candidate_questions("PM", [])][:MAX_QUESTIONS]
+    a = make_assessor(completion({"t": "Thanks.", "q": None, "s": {"A": 3}, "e": ["GOV_AWARE"], "d": True}))
+    out = run(a, asked, {"A": 1, "B": 2}, ["RISK_AWARE"])
+
+    assert a.client.max_tokens == [200]
+    assert out["done"] is True and out["next_question_id"] is None
+    assert out["scores"] == {"A": 3}
+    assert out["report"]["domain_scores"]["A"] == 3
+    assert out["report"]["domain_scores"]["B"] == 2
+    assert out["report"]["top_risks"] == ["RISK_AWARE"]
+
+
+def test_early_done_does_not_queue_question(make_assessor):
+    a = make_assessor(completion({"t": "Done.", "q": "CORE_B1", "d": True}))
+    out = run(a, ["CORE_A1"], {}, [])
+    assert out["done"] is True
+    assert out["next_question_id"] is None
+    assert out["report"] is not None